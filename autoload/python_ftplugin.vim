@@ -16,12 +16,7 @@ let s:profile_dir = expand('<sfile>:p:h:h')
 
 function! s:infer_types(base) " {{{1
   " TODO This is a quick hack that should be refactored and cleaned up!
-  if !exists('s:inference_loaded')
-    python import vim
-    let scriptfile = s:profile_dir . '/misc/python-ftplugin/inference.py'
-    execute 'pyfile' fnameescape(scriptfile)
-    let s:inference_loaded = 1
-  endif
+  call s:load_inference_script()
   let line = line('.')
   let column = col('.')
   let lines = getline(1, '$')
@@ -170,16 +165,177 @@ function! python_ftplugin#syntax_check() " {{{1
 endfunction
 
 function! python_ftplugin#jump(motion) range " {{{1
-    let cnt = v:count1
-    let save = @/    " save last search pattern
+  " Jump v:count1 times to the class or function definition selected by the
+  " given motion: ']]' and '[[' jump to the next/previous definition in the
+  " first column, ']m' and '[m' jump to the next/previous definition and '[u'
+  " jumps to the enclosing definition.
+  let index = python_ftplugin#definitions()
+  let lnum = line('.')
+  if a:motion == '[u'
+    let target = s:enclosing_definition(index, lnum, v:count1)
+  else
+    let lines = a:motion =~ '^\(\]\]\|\[\[\)$' ? index['toplevel'] : index['lines']
+    let target = s:next_definition(lines, lnum, a:motion[0] == ']' ? v:count1 : -v:count1)
+  endif
+  if target > 0
     mark '
-    while cnt > 0
-    silent! exe a:motion
-    let cnt = cnt - 1
+    call cursor(target, 1)
+  endif
+endfunction
+
+function! python_ftplugin#definitions() " {{{1
+  " Returns an index of the class and function definitions in the current
+  " buffer. This is a dictionary with the sorted line numbers of the
+  " definitions ('lines'), their indentation ('indents'), the last line of
+  " their bodies ('ends'), the position of the enclosing definition in these
+  " lists ('parents', -1 when there is none) and the line numbers of the
+  " definitions in the first column ('toplevel').
+  " The index is rebuilt when the buffer has changed since it was last used.
+  if exists('b:python_definitions') && b:python_definitions['changedtick'] == b:changedtick
+    return b:python_definitions
+  endif
+  let index = {'changedtick': b:changedtick, 'lines': [], 'indents': [], 'ends': [], 'parents': [], 'toplevel': []}
+  let stack = []
+  let pattern = '^\s*\%(class\|def\)\>'
+  let lnum = 0
+  let last = 0
+  let [quote, depth, backslash] = ['', 0, 0]
+  for line in getline(1, '$')
+    let lnum += 1
+    " Lines that continue a string, an expression in brackets or a line that
+    " ends in a backslash belong to the preceding statement.
+    let continued = !empty(quote) || depth > 0 || backslash
+    let [quote, depth, backslash] = s:scan_line(line, quote, depth)
+    if continued
+      let last = lnum
+      continue
+    endif
+    " Blank lines and comments don't end a definition.
+    if line =~ '^\s*\%(#.*\)\=$'
+      continue
+    endif
+    " Any other line that isn't indented further ends the definitions.
+    let indent = indent(lnum)
+    while !empty(stack) && index['indents'][stack[-1]] >= indent
+      let index['ends'][remove(stack, -1)] = last
     endwhile
-    call histdel('/', -1)
-    let @/ = save    " restore last search pattern
-endfun
+    if line =~ pattern
+      call add(index['lines'], lnum)
+      call add(index['indents'], indent)
+      call add(index['ends'], lnum)
+      call add(index['parents'], empty(stack) ? -1 : stack[-1])
+      if indent == 0
+        call add(index['toplevel'], lnum)
+      endif
+      call add(stack, len(index['lines']) - 1)
+    endif
+    let last = lnum
+  endfor
+  for i in stack
+    let index['ends'][i] = last
+  endfor
+  let b:python_definitions = index
+  return index
+endfunction
+
+function! s:scan_line(line, quote, depth) " {{{2
+  " Scans a line of Python code for strings, brackets and comments. Takes the
+  " delimiter of the string that's open at the start of the line (or '') and
+  " the bracket depth there. Returns the same at the end of the line, plus
+  " whether a backslash continues the line.
+  let quote = a:quote
+  let depth = a:depth
+  let i = 0
+  while 1
+    if !empty(quote)
+      " Find the end of the string, skipping escaped characters.
+      let i = match(a:line, '\\.\|' . quote, i)
+      if i < 0
+        " Only triple quoted strings and escaped line ends span lines.
+        let continued = a:line =~ '\\$'
+        return [len(quote) == 3 || continued ? quote : '', depth, 0]
+      elseif a:line[i] == '\'
+        let i += 2
+      else
+        let i += len(quote)
+        let quote = ''
+      endif
+    else
+      let i = match(a:line, '"""\|''''''\|["''#()[\]{}]', i)
+      if i < 0
+        return [quote, depth, a:line =~ '\\$']
+      elseif a:line[i] == '#'
+        return [quote, depth, 0]
+      endif
+      let token = a:line[i : i + 2] =~ '^\%("""\|''''''\)$' ? a:line[i : i + 2] : a:line[i]
+      if token =~ '^["'']'
+        let quote = token
+      elseif token =~ '[([{]'
+        let depth += 1
+      else
+        let depth = max([0, depth - 1])
+      endif
+      let i += len(token)
+    endif
+  endwhile
+endfunction
+
+function! s:bisect(lines, lnum) " {{{2
+  " Returns the number of line numbers in the sorted list that are less than
+  " or equal to lnum.
+  let low = 0
+  let high = len(a:lines)
+  while low < high
+    let middle = (low + high) / 2
+    if a:lines[middle] <= a:lnum
+      let low = middle + 1
+    else
+      let high = middle
+    endif
+  endwhile
+  return low
+endfunction
+
+function! s:next_definition(lines, lnum, count) " {{{2
+  " Returns the line number count definitions after (or before, when count is
+  " negative) lnum, honoring 'wrapscan'. Returns 0 when there is none.
+  let total = len(a:lines)
+  if total == 0
+    return 0
+  endif
+  if a:count > 0
+    " Position of the first definition after lnum.
+    let i = s:bisect(a:lines, a:lnum)
+    let target = i + a:count - 1
+  else
+    " Position of the first definition before lnum, plus one.
+    let i = s:bisect(a:lines, a:lnum - 1)
+    let target = i + a:count
+  endif
+  if &wrapscan
+    let target = ((target % total) + total) % total
+  elseif (a:count > 0 && i >= total) || (a:count < 0 && i == 0)
+    return 0
+  else
+    let target = max([0, min([target, total - 1])])
+  endif
+  return a:lines[target]
+endfunction
+
+function! s:enclosing_definition(index, lnum, count) " {{{2
+  " Returns the line number of the definition count levels up from the
+  " definition enclosing lnum. Returns 0 when there is none.
+  let i = s:bisect(a:index['lines'], a:lnum - 1) - 1
+  while i >= 0 && a:index['ends'][i] < a:lnum
+    let i = a:index['parents'][i]
+  endwhile
+  let cnt = a:count - 1
+  while i >= 0 && cnt > 0
+    let i = a:index['parents'][i]
+    let cnt -= 1
+  endwhile
+  return i >= 0 ? a:index['lines'][i] : 0
+endfunction
 
 function! python_ftplugin#include_expr(fname) " {{{1
   call s:load_python_script()
@@ -194,64 +350,16 @@ function! python_ftplugin#omni_complete(findstart, base) " {{{1
     return s:find_start('variable')
   else
     let starttime = python_ftplugin#misc#timer#start()
-    let candidates = []
-    if s:do_variable_completion(a:base[-1:])
-      let base = a:base
-      if match(s:get_continued_line(), '\<from\>') >= 0
-        let from = s:get_base_module()
-        if !empty(from)
-          let base = from . '.' . a:base
-        endif
-      else
-        let imports = s:get_imports(a:base)
-      endif
-      call s:load_python_script()
-      redir => listing
-        silent python complete_variables(vim.eval('base'))
-      redir END
-      let completes = split(listing, '\n')
-      let pattern = '^' . python_ftplugin#misc#escape#pattern(base)
-      call filter(completes, 'v:val =~# pattern')
-      if exists('from') && !empty(from)
-        call map(completes, 'v:val[len(from) + 1 :]')
-      endif
-      call extend(candidates, completes)
-      if exists('imports')
-        redir => listing
-        let base = a:base[stridx(a:base, '.')+1 :]
-        for module in keys(imports)
-          let module = imports[module] . '.' . base
-          silent python complete_variables(vim.eval('module'))
-        endfor
-        redir END
-        let completes = split(listing, '\n')
-        for module in keys(imports)
-          let pattern = '^' . python_ftplugin#misc#escape#pattern(imports[module]) . '\.'
-          let index = len(imports[module])
-          for compl in completes
-            if compl =~# pattern
-              call add(candidates, module . '.' . compl[index+1:])
-            endif
-          endfor
-        endfor
-      endif
-    endif
-    if s:do_module_completion(a:base[-1:])
-      if !exists('imports')
-        let imports = s:get_imports(a:base)
-      endif
-      call extend(candidates, s:add_modules(a:base, imports))
-    endif
-    " Filter the completion candidates according to the given base.
-    let pattern = '^' . python_ftplugin#misc#escape#pattern(a:base)
-    call filter(candidates, 'v:val =~# pattern')
-    let pattern = pattern . '\.'
+    let [names, inferred] = s:get_candidates(a:base)
+    let candidates = copy(names)
+    " Don't suggest the members of a name that's already complete.
+    let pattern = '^' . python_ftplugin#misc#escape#pattern(a:base) . '\.'
     call filter(candidates, 'v:val !~ pattern')
     " Convert the completion candidates to dictionaries to make them
     " compatible with the candidates generated by the type inference engine.
     call map(candidates, '{"word": v:val}')
     " Add the completion candidates suggested by the type inference engine.
-    call extend(candidates, s:infer_types(a:base))
+    call extend(candidates, deepcopy(inferred))
     " Sort the completion candidates.
     call sort(candidates, 's:friendly_sort')
     " Provide some feedback in case of :verbose.
@@ -260,6 +368,144 @@ function! python_ftplugin#omni_complete(findstart, base) " {{{1
   endif
 endfunction
 
+function! s:get_candidates(base) " {{{1
+  " Returns a list with two lists of completion candidates for base: The
+  " module and variable names (strings) and the suggestions of the type
+  " inference engine (dictionaries). Results are cached per buffer, line,
+  " context, module path and the kinds of completion that apply. When base
+  " extends the base of a cached result, the cached result is narrowed down
+  " instead of being recomputed.
+  let variables = s:do_variable_completion(a:base[-1:])
+  let modules = s:do_module_completion(a:base[-1:])
+  let size = python_ftplugin#misc#option#get('python_completion_cache_size', 25)
+  if size <= 0
+    return s:compute_candidates(a:base, variables, modules)
+  endif
+  " Vim removes the base from the line before asking for the candidates, so
+  " the text around the cursor identifies the context.
+  let line = getline('.')
+  let before = substitute(strpart(line, 0, col('.') - 1), '[A-Za-z0-9_.]*$', '', '')
+  let after = strpart(line, col('.') - 1)
+  let key = join([bufnr('%'), line('.'), before, after, matchstr(a:base, '^.*\ze\.'), variables, modules], "\n")
+  " The other lines of the buffer shouldn't have changed either.
+  let others = join(getline(1, line('.') - 1) + getline(line('.') + 1, '$'), "\n")
+  let signature = exists('*sha256') ? sha256(others) : others
+  let entry = get(s:completion_cache, key, {})
+  " An empty base doesn't select any imported names (see s:get_imports()) so
+  " it can't be narrowed down.
+  if !empty(entry) && entry['signature'] ==# signature
+        \ && entry['base'] !~ '^\.*$' && stridx(a:base, entry['base']) == 0
+    let s:completion_cache_stats['hits'] += 1
+    if a:base !=# entry['base']
+      let pattern = '^' . python_ftplugin#misc#escape#pattern(a:base)
+      call filter(entry['names'], 'v:val =~# pattern')
+      if a:base =~ '\.'
+        call filter(entry['inferred'], 'v:val["word"] =~ pattern')
+      elseif has('python')
+        " Without a dot the whole base is the expression whose members the
+        " type inference engine suggests, so its suggestions can't be narrowed.
+        let entry['inferred'] = s:infer_types(a:base)
+      endif
+      let entry['base'] = a:base
+    endif
+    call remove(s:completion_cache_order, index(s:completion_cache_order, key))
+  else
+    let s:completion_cache_stats['misses'] += 1
+    let [names, inferred] = s:compute_candidates(a:base, variables, modules)
+    let entry = {'base': a:base, 'signature': signature, 'names': names, 'inferred': inferred}
+    if has_key(s:completion_cache, key)
+      call remove(s:completion_cache_order, index(s:completion_cache_order, key))
+    endif
+    let s:completion_cache[key] = entry
+  endif
+  " Mark the entry as most recently used and evict the least recently used
+  " entries when the cache is full.
+  call add(s:completion_cache_order, key)
+  while len(s:completion_cache_order) > size
+    call remove(s:completion_cache, remove(s:completion_cache_order, 0))
+  endwhile
+  return [entry['names'], entry['inferred']]
+endfunction
+
+function! python_ftplugin#completion_cache_stats() " {{{1
+  " Returns a dictionary with the number of cache hits and misses of omni
+  " completion and the number of entries currently in the cache.
+  let stats = copy(s:completion_cache_stats)
+  let stats['entries'] = len(s:completion_cache_order)
+  return stats
+endfunction
+
+function! python_ftplugin#clear_completion_cache() " {{{1
+  " Forget all cached completion candidates and reset the hit/miss counters.
+  let s:completion_cache = {}
+  let s:completion_cache_order = []
+  let s:completion_cache_stats = {'hits': 0, 'misses': 0}
+endfunction
+
+call python_ftplugin#clear_completion_cache()
+
+function! s:compute_candidates(base, variables, modules) " {{{1
+  if !has('python')
+    if !exists('s:python_warned')
+      call python_ftplugin#misc#msg#warn("python.vim %s: Completion requires Vim compiled with Python support!", g:python_ftplugin#version)
+      let s:python_warned = 1
+    endif
+    return [[], []]
+  endif
+  let candidates = []
+  if a:variables
+    let base = a:base
+    if match(s:get_continued_line(), '\<from\>') >= 0
+      let from = s:get_base_module()
+      if !empty(from)
+        let base = from . '.' . a:base
+      endif
+    else
+      let imports = s:get_imports(a:base)
+    endif
+    call s:load_python_script()
+    redir => listing
+      silent python complete_variables(vim.eval('base'))
+    redir END
+    let completes = split(listing, '\n')
+    let pattern = '^' . python_ftplugin#misc#escape#pattern(base)
+    call filter(completes, 'v:val =~# pattern')
+    if exists('from') && !empty(from)
+      call map(completes, 'v:val[len(from) + 1 :]')
+    endif
+    call extend(candidates, completes)
+    if exists('imports')
+      redir => listing
+      let base = a:base[stridx(a:base, '.')+1 :]
+      for module in keys(imports)
+        let module = imports[module] . '.' . base
+        silent python complete_variables(vim.eval('module'))
+      endfor
+      redir END
+      let completes = split(listing, '\n')
+      for module in keys(imports)
+        let pattern = '^' . python_ftplugin#misc#escape#pattern(imports[module]) . '\.'
+        let index = len(imports[module])
+        for compl in completes
+          if compl =~# pattern
+            call add(candidates, module . '.' . compl[index+1:])
+          endif
+        endfor
+      endfor
+    endif
+  endif
+  if a:modules
+    if !exists('imports')
+      let imports = s:get_imports(a:base)
+    endif
+    call extend(candidates, s:add_modules(a:base, imports))
+  endif
+  " Filter the completion candidates according to the given base.
+  let pattern = '^' . python_ftplugin#misc#escape#pattern(a:base)
+  call filter(candidates, 'v:val =~# pattern')
+  return [candidates, s:infer_types(a:base)]
+endfunction
+
 function! s:friendly_sort(a, b) " {{{1
   let a = substitute(tolower(a:a['word']), '_', '\~', 'g')
   let b = substitute(tolower(a:b['word']), '_', '\~', 'g')
@@ -415,20 +661,112 @@ function! python_ftplugin#auto_complete(chr) " {{{1
     let result = "\<C-x>\<C-o>\<C-n>"
   endif
   if exists('result')
-    call python_ftplugin#misc#msg#debug("python.vim %s: %s %s completion.", g:python_ftplugin#version, pumvisible() ? "Continuing" : "Starting", type)
-    " Make sure Vim opens the menu but doesn't enter the first match.
-    let b:python_cot_save = &completeopt
-    set cot+=menu cot+=menuone cot+=longest
-    " Restore &completeopt after completion.
-    augroup PluginFileTypePython
-      autocmd! CursorHold,CursorHoldI <buffer> call s:restore_completeopt()
-    augroup END
+    " Cancel the completion of a previous trigger that hasn't started yet.
+    call s:cancel_auto_complete()
+    let delay = has('timers') ? python_ftplugin#misc#option#get('python_auto_complete_delay', 100) : 0
+    if delay > 0
+      " Enter the text now but wait for the user to stop typing before
+      " starting completion. The timer is started from the expression register
+      " so that Vim has entered the text (and anything typed before it) by
+      " then, which is what the timer compares against.
+      let text = a:chr . substitute(result, "\<C-x>\<C-o>\<C-n>$", '', '')
+      return text . "\<C-r>=python_ftplugin#schedule_completion(" . string(type) . ", " . delay . ")\<CR>"
+    endif
     " Enter character and start completion.
-    return a:chr . result
+    return a:chr . s:start_completion(type, result)
   endif
   return a:chr
 endfunction
 
+function! s:start_completion(type, keys) " {{{1
+  " Prepares &completeopt for automatic completion and returns the given keys.
+  call python_ftplugin#misc#msg#debug("python.vim %s: %s %s completion.", g:python_ftplugin#version, pumvisible() ? "Continuing" : "Starting", a:type)
+  " Make sure Vim opens the menu but doesn't enter the first match.
+  let b:python_cot_save = &completeopt
+  set cot+=menu cot+=menuone cot+=longest
+  " Restore &completeopt after completion.
+  augroup PluginFileTypePython
+    autocmd! CursorHold,CursorHoldI <buffer> call s:restore_completeopt()
+  augroup END
+  return a:keys
+endfunction
+
+let s:pending_auto_complete = {}
+
+function! python_ftplugin#schedule_completion(type, delay) " {{{1
+  " Used by python_ftplugin#auto_complete() to start completion after the
+  " given delay, unless the user keeps typing. Returns an empty string so that
+  " it can be called from the expression register.
+  call s:cancel_auto_complete()
+  let s:pending_auto_complete = {
+        \ 'bufnr': bufnr('%'),
+        \ 'lnum': line('.'),
+        \ 'col': col('.'),
+        \ 'line': getline('.'),
+        \ 'type': a:type,
+        \ 'timer': timer_start(a:delay, function('s:auto_complete_timer')),
+        \ }
+  return ''
+endfunction
+
+function! s:auto_complete_timer(timer) " {{{1
+  " Starts the completion that was deferred by python_ftplugin#auto_complete(),
+  " unless it was superseded by further typing.
+  let pending = s:pending_auto_complete
+  if empty(pending) || pending['timer'] != a:timer
+    return
+  endif
+  let s:pending_auto_complete = {}
+
+function! python_ftplugin#schedule_completion(type, delay) " {{{1
+  " Used by python_ftplugin#auto_complete() to start completion after the
+  " given delay, unless the user keeps typing. Returns an empty string so that
+  " it can be called from the expression register.
+  call s:cancel_auto_complete()
+  let s:pending_auto_complete = {
+        \ 'bufnr': bufnr('%'),
+        \ 'lnum': line('.'),
+        \ 'col': col('.'),
+        \ 'line': getline('.'),
+        \ 'type': a:type,
+        \ 'timer': timer_start(a:delay, function('s:auto_complete_timer')),
+        \ }
+  return ''
+endfunction
+  if mode() !=# 'i'
+        \ || bufnr('%') != pending['bufnr']
+        \ || line('.') != pending['lnum']
+        \ || col('.') != pending['col']
+        \ || getline('.') !=# pending['line']
+    call python_ftplugin#misc#msg#debug("python.vim %s: Skipping superseded %s completion.", g:python_ftplugin#version, pending['type'])
+    return
+  endif
+  call feedkeys(s:start_completion(pending['type'], "\<C-x>\<C-o>\<C-n>"), 'n')
+endfunction
+
+function! s:cancel_auto_complete() " {{{1
+  if !empty(s:pending_auto_complete)
+    call timer_stop(s:pending_auto_complete['timer'])
+    let s:pending_auto_complete = {}
+
+function! python_ftplugin#schedule_completion(type, delay) " {{{1
+  " Used by python_ftplugin#auto_complete() to start completion after the
+  " given delay, unless the user keeps typing. Returns an empty string so that
+  " it can be called from the expression register.
+  call s:cancel_auto_complete()
+  let s:pending_auto_complete = {
+        \ 'bufnr': bufnr('%'),
+        \ 'lnum': line('.'),
+        \ 'col': col('.'),
+        \ 'line': getline('.'),
+        \ 'type': a:type,
+        \ 'timer': timer_start(a:delay, function('s:auto_complete_timer')),
+        \ }
+  return ''
+endfunction
+  endif
+endfunction
+
 function! s:do_module_completion(chr) " {{{1
   let chr = a:chr
   if chr == ''
@@ -568,6 +906,78 @@ function! s:load_python_script() " {{{2
   endif
 endfunction
 
+function! s:load_inference_script() " {{{2
+  if !exists('s:inference_loaded')
+    python import vim
+    let scriptfile = s:profile_dir . '/misc/python-ftplugin/inference.py'
+    execute 'pyfile' fnameescape(scriptfile)
+    let s:inference_loaded = 1
+  endif
+endfunction
+
+function! python_ftplugin#prefetch() " {{{1
+  " Warms the caches used by completion while Vim is idle: The module index,
+  " the members of the modules imported in the buffer and the type inference
+  " engine. Does nothing when the buffer hasn't changed since the last
+  " time it was prefetched.
+  if !has('python') || !python_ftplugin#misc#option#get('python_prefetch', 1)
+        \ || get(b:, 'python_prefetch_tick', -1) == b:changedtick
+    return
+  endif
+  let b:python_prefetch_tick = b:changedtick
+  let starttime = python_ftplugin#misc#timer#start()
+  call s:load_python_script()
+  let modules = s:find_imported_modules()
+  " Walk the module index down to each imported module.
+  for module in modules
+    let done = []
+    let node = python_ftplugin#get_modules(done, s:module_completion_cache)
+    for name in split(module, '\.')
+      if !has_key(node, name)
+        break
+      endif
+      call add(done, name)
+      let node = python_ftplugin#get_modules(done, node[name])
+    endfor
+  endfor
+  " Importing modules can have side effects, so only do this when the user
+  " opted in to automatic completion of variables.
+  if python_ftplugin#misc#option#get('python_auto_complete_variables', 0)
+    call filter(modules, '!has_key(s:prefetched_modules, v:val)')
+    if !empty(modules)
+      silent python prefetch_modules(vim.eval('modules'))
+      for module in modules
+        let s:prefetched_modules[module] = 1
+      endfor
+    endif
+  endif
+  call s:load_inference_script()
+  call python_ftplugin#misc#timer#stop("python.vim %s: Prefetched completion data in %s.", g:python_ftplugin#version, starttime)
+endfunction
+
+let s:prefetched_modules = {}
+
+function! s:find_imported_modules() " {{{2
+  " Returns the names of the modules imported in the current buffer.
+  let modules = {}
+  for line in getline(1, '$')
+    let from = matchstr(line, '^\s*from\s\+\zs[A-Za-z0-9_.]\+\ze\s\+import\>')
+    if !empty(from)
+      let modules[from] = 1
+    elseif line =~ '^\s*import\s'
+      let names = substitute(line, '^\s*import\s\+\|\s*#.*$', '', 'g')
+      for name in split(names, '\s*,\s*')
+        let name = matchstr(name, '^[A-Za-z0-9_.]\+')
+        if !empty(name)
+          let modules[name] = 1
+        endif
+      endfor
+    endif
+  endfor
+  " Relative imports can't be resolved from the module search path.
+  return filter(keys(modules), 'v:val !~ "^\\."')
+endfunction
+
 function! s:restore_completeopt() " {{{1
   " Restore the original value of &completeopt.
   if exists('b:python_cot_save')
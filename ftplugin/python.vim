@@ -72,14 +72,16 @@ augroup PluginFileTypePython
 augroup END
 
 " Mappings to jump between classes and functions. {{{1
-nnoremap <silent> <buffer> ]] :call python_ftplugin#jump('/^\(class\\|def\)')<cr>
-nnoremap <silent> <buffer> [[ :call python_ftplugin#jump('?^\(class\\|def\)')<cr>
-nnoremap <silent> <buffer> ]m :call python_ftplugin#jump('/^\s*\(class\\|def\)')<cr>
-nnoremap <silent> <buffer> [m :call python_ftplugin#jump('?^\s*\(class\\|def\)')<cr>
+nnoremap <silent> <buffer> ]] :<C-u>call python_ftplugin#jump(']]')<cr>
+nnoremap <silent> <buffer> [[ :<C-u>call python_ftplugin#jump('[[')<cr>
+nnoremap <silent> <buffer> ]m :<C-u>call python_ftplugin#jump(']m')<cr>
+nnoremap <silent> <buffer> [m :<C-u>call python_ftplugin#jump('[m')<cr>
+nnoremap <silent> <buffer> [u :<C-u>call python_ftplugin#jump('[u')<cr>
 call add(s:undo_ftplugin, 'nunmap <buffer> ]]')
 call add(s:undo_ftplugin, 'nunmap <buffer> [[')
 call add(s:undo_ftplugin, 'nunmap <buffer> ]m')
 call add(s:undo_ftplugin, 'nunmap <buffer> [m')
+call add(s:undo_ftplugin, 'nunmap <buffer> [u')
 
 " Enable syntax folding. {{{1
 if python_ftplugin#misc#option#get('python_syntax_fold', 1)
@@ -110,6 +112,14 @@ augroup END
 inoremap <buffer> <expr> <Space> python_ftplugin#auto_complete(' ')
 inoremap <buffer> <expr> . python_ftplugin#auto_complete('.')
 
+" Prefetch completion data while Vim is idle. This uses a separate group because
+" the CursorHold automatic command in PluginFileTypePython is replaced during
+" automatic completion.
+augroup PluginFileTypePythonPrefetch
+  autocmd! CursorHold,BufEnter <buffer> call python_ftplugin#prefetch()
+  call add(s:undo_ftplugin, 'autocmd! PluginFileTypePythonPrefetch CursorHold,BufEnter <buffer>')
+augroup END
+
 " }}}1
 
 " Let Vim know how to disable the plug-in.
@@ -95,6 +95,18 @@ def load_module(todo, done):
     done.append(todo.pop(0))
   return module
 
+def prefetch_modules(names):
+  '''
+  Import the given modules ahead of time so that completing their variables
+  doesn't have to wait for the import (used by the idle time prefetcher).
+  '''
+  for name in names:
+    try:
+      load_module([x for x in name.split('.') if x], [])
+    except Exception:
+      # Prefetching is opportunistic, errors will surface during completion.
+      pass
+
 def find_module_path(name):
   '''
   Look for a Python module on the module search path (used for "gf" and
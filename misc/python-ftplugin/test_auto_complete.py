@@ -0,0 +1,30 @@
+import pytest
+
+from vimtest import has_vim, run_vim
+
+pytestmark = pytest.mark.skipif(not has_vim(), reason='Vim is not available')
+
+def count_completions(keys):
+  ''' Type keys at the end of the buffer and count how often completion started. '''
+  return run_vim('\n', [
+    'let g:python_auto_complete_delay = 50',
+    'let g:completions = 0',
+    'function! CountCompletions(findstart, base)',
+    '  let g:completions += a:findstart',
+    '  return a:findstart ? col(".") - 1 : []',
+    'endfunction',
+    'setlocal omnifunc=CountCompletions',
+    # Leave insert mode well after the delay has passed.
+    'call timer_start(300, {-> feedkeys("\\<Esc>", "t")})',
+    'call feedkeys("A%s", "tx!")' % keys,
+    'echo g:completions',
+  ])[-1]
+
+def test_untouched_trigger_completes():
+  assert count_completions('os.') == '1'
+
+def test_further_typing_cancels_trigger():
+  assert count_completions('os.p') == '0'
+
+def test_newer_trigger_supersedes_older_one():
+  assert count_completions('os.path.') == '1'
@@ -0,0 +1,28 @@
+import pytest
+
+from vimtest import has_vim, run_vim
+
+pytestmark = pytest.mark.skipif(not has_vim(), reason='Vim is not available')
+
+SOURCE = '''\
+import os
+
+'''
+
+def complete(keys):
+  ''' Type keys on the last line (in insert mode) and report the cache statistics. '''
+  return run_vim(SOURCE, [
+    'let g:python_auto_complete_modules = 0',
+    'setlocal completeopt=menu,longest',
+    'call python_ftplugin#clear_completion_cache()',
+    'call feedkeys("GA%s\\<Esc>", "tx")' % keys,
+    'echo python_ftplugin#completion_cache_stats()',
+  ])[-1]
+
+def test_narrowing_hit():
+  stats = complete('os.p\\<C-x>\\<C-o>a\\<C-x>\\<C-o>')
+  assert stats == "{'hits': 1, 'misses': 1, 'entries': 1}"
+
+def test_other_module_path_misses():
+  stats = complete('os.p\\<C-x>\\<C-o>\\<C-e>\\<BS>\\<BS>\\<BS>\\<BS>sys.\\<C-x>\\<C-o>')
+  assert stats == "{'hits': 0, 'misses': 2, 'entries': 2}"
@@ -0,0 +1,79 @@
+import pytest
+
+from vimtest import has_vim, run_vim
+
+SOURCE = '''\
+class A:
+    def f(self):
+        pass
+
+if True:
+    def g():
+        pass
+
+def h():
+    x = 1
+
+    def i():
+        # Nested.
+        pass
+    return i
+'''
+
+def jump(lnum, keys):
+  return 'call cursor(%i, 1) | execute "normal %s" | echo line(".")' % (lnum, keys)
+
+pytestmark = pytest.mark.skipif(not has_vim(), reason='Vim is not available')
+
+def test_definition_index():
+  lines = run_vim(SOURCE, [
+    'let index = python_ftplugin#definitions()',
+    'echo index.lines',
+    'echo index.ends',
+    'echo index.parents',
+    'echo index.toplevel',
+  ])
+  assert lines == ['[1, 2, 6, 9, 12]', '[3, 3, 7, 15, 14]', '[-1, 0, -1, -1, 3]', '[1, 9]']
+
+def test_jumps():
+  assert run_vim(SOURCE, [
+    jump(1, ']]'),
+    jump(1, '2]m'),
+    jump(15, '[['),
+    jump(15, '3[m'),
+  ]) == ['9', '6', '9', '6']
+
+def test_enclosing_definition():
+  assert run_vim(SOURCE, [
+    jump(6, '[u'),
+    jump(7, '[u'),
+    jump(14, '2[u'),
+    jump(15, '[u'),
+  ]) == ['6', '6', '9', '9']
+
+CONTINUED = '''\
+class A:
+    def f(self):
+        sql = """
+SELECT 1
+def fake():
+"""
+        return sql
+
+    def g(self):
+        x = max(1,
+2)
+        return x
+'''
+
+def test_continued_lines():
+  lines = run_vim(CONTINUED, [
+    'let index = python_ftplugin#definitions()',
+    'echo index.lines',
+    'echo index.ends',
+    'echo index.parents',
+    jump(7, '[u'),
+    jump(12, '[u'),
+    jump(12, '2[u'),
+  ])
+  assert lines == ['[1, 2, 9]', '[12, 7, 12]', '[-1, 0, 0]', '2', '9', '1']
@@ -0,0 +1,40 @@
+# Helpers to test the Vim script parts of the plug-in in a headless Vim.
+
+import os
+import shutil
+import subprocess
+import tempfile
+
+PLUGIN_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+def has_vim():
+  try:
+    return subprocess.call(['vim', '--version'], stdout=open(os.devnull, 'w')) == 0
+  except OSError:
+    return False
+
+def run_vim(source, commands):
+  ''' Run Ex commands in Vim on the given source and return the lines they :echo. '''
+  directory = tempfile.mkdtemp()
+  try:
+    pyfile = os.path.join(directory, 'example.py')
+    output = os.path.join(directory, 'output.txt')
+    script = os.path.join(directory, 'script.vim')
+    with open(pyfile, 'w') as handle:
+      handle.write(source)
+    with open(script, 'w') as handle:
+      handle.write('\n'.join([
+        'set rtp^=%s' % PLUGIN_DIR,
+        'filetype plugin on',
+        'edit %s' % pyfile,
+        'redir! > %s' % output,
+      ] + commands + ['redir END', 'qa!']) + '\n')
+    # Keep standard input open so that Vim can wait for input in insert mode
+    # (e.g. feedkeys() with the '!' flag) while timers fire.
+    process = subprocess.Popen(['vim', '-Nu', 'NONE', '-i', 'NONE', '-es', '-S', script], stdin=subprocess.PIPE)
+    process.wait()
+    process.stdin.close()
+    with open(output) as handle:
+      return [line for line in handle.read().splitlines() if line]
+  finally:
+    shutil.rmtree(directory)